@@ -9,27 +9,48 @@ Features:
 - Scenario comparison capabilities
 """
 
-from fastapi import FastAPI, Query, WebSocket, WebSocketDisconnect
+from fastapi import FastAPI, Query, Header, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
-import json
+from fastapi.responses import Response, StreamingResponse, ORJSONResponse
+import orjson
+import msgpack
 import math
 import asyncio
+import os
 import httpx
-from datetime import datetime, timezone
-from typing import Optional, List
-from dataclasses import dataclass, asdict
+from datetime import datetime, timezone, timedelta
+from typing import Optional, List, Callable, Awaitable
+from dataclasses import dataclass, field
 from enum import Enum
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 import time
+import struct
+import hashlib
+import numpy as np
 
 # SGP4 for accurate orbital propagation
-from sgp4.api import Satrec, jday
-from sgp4 import exporter
+from sgp4.api import Satrec, SatrecArray, jday
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Release the shared CelesTrak client and propagation pool on shutdown"""
+    yield
+    # Stop websocket hubs first; their next tick would use the client and pool
+    tasks = [hub.task for hub in hubs.values() if hub.task]
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    await HTTP_CLIENT.aclose()
+    PROP_POOL.shutdown(wait=False)
 
 app = FastAPI(
     title="Satellite Constellation Simulator",
     description="Real-time satellite tracking with CelesTrak data",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 app.add_middleware(
@@ -50,15 +71,17 @@ class OrbitType(str, Enum):
     GEO = "GEO"  # Geostationary (35786 km)
     HEO = "HEO"  # Highly Elliptical Orbit
 
-@dataclass
+@dataclass(slots=True)
 class Satellite:
     id: str
     name: str
     orbit_type: OrbitType
     tle_line1: str
     tle_line2: str
+    # Parsed SGP4 record, built once in parse_tle
+    _satrec: Optional[Satrec] = field(default=None, compare=False, repr=False)
     
-@dataclass 
+@dataclass(slots=True)
 class Scenario:
     id: str
     name: str
@@ -66,12 +89,24 @@ class Scenario:
     satellite_count: int
     tle_url: str
     created_at: str
+    
+    def to_dict(self) -> dict:
+        """Flat dict without asdict's recursive copy"""
+        return {
+            "id": self.id,
+            "name": self.name,
+            "description": self.description,
+            "satellite_count": self.satellite_count,
+            "tle_url": self.tle_url,
+            "created_at": self.created_at
+        }
 
 # ============================================================================
 # CelesTrak TLE Sources
 # ============================================================================
 
 CELESTRAK_BASE = "https://celestrak.org/NORAD/elements/gp.php"
+SCENARIOS_CREATED_AT = datetime.now(timezone.utc).isoformat()
 
 SCENARIOS = {
     "starlink": Scenario(
@@ -80,7 +115,7 @@ SCENARIOS = {
         description="SpaceX Starlink broadband satellites",
         satellite_count=0,  # Updated on fetch
         tle_url=f"{CELESTRAK_BASE}?GROUP=starlink&FORMAT=tle",
-        created_at=datetime.now(timezone.utc).isoformat()
+        created_at=SCENARIOS_CREATED_AT
     ),
     "gps": Scenario(
         id="gps",
@@ -88,7 +123,7 @@ SCENARIOS = {
         description="US Global Positioning System satellites",
         satellite_count=0,
         tle_url=f"{CELESTRAK_BASE}?GROUP=gps-ops&FORMAT=tle",
-        created_at=datetime.now(timezone.utc).isoformat()
+        created_at=SCENARIOS_CREATED_AT
     ),
     "iridium": Scenario(
         id="iridium",
@@ -96,7 +131,7 @@ SCENARIOS = {
         description="Iridium satellite phone constellation",
         satellite_count=0,
         tle_url=f"{CELESTRAK_BASE}?GROUP=iridium-NEXT&FORMAT=tle",
-        created_at=datetime.now(timezone.utc).isoformat()
+        created_at=SCENARIOS_CREATED_AT
     ),
     "space-stations": Scenario(
         id="space-stations",
@@ -104,7 +139,7 @@ SCENARIOS = {
         description="ISS and other crewed stations",
         satellite_count=0,
         tle_url=f"{CELESTRAK_BASE}?GROUP=stations&FORMAT=tle",
-        created_at=datetime.now(timezone.utc).isoformat()
+        created_at=SCENARIOS_CREATED_AT
     ),
     "oneweb": Scenario(
         id="oneweb",
@@ -112,7 +147,7 @@ SCENARIOS = {
         description="OneWeb broadband satellites",
         satellite_count=0,
         tle_url=f"{CELESTRAK_BASE}?GROUP=oneweb&FORMAT=tle",
-        created_at=datetime.now(timezone.utc).isoformat()
+        created_at=SCENARIOS_CREATED_AT
     ),
     "active": Scenario(
         id="active",
@@ -120,32 +155,209 @@ SCENARIOS = {
         description="All currently active satellites (large dataset)",
         satellite_count=0,
         tle_url=f"{CELESTRAK_BASE}?GROUP=active&FORMAT=tle",
-        created_at=datetime.now(timezone.utc).isoformat()
+        created_at=SCENARIOS_CREATED_AT
     ),
 }
 
+# Serialized once; fetch_tle_data patches satellite_count in place
+SCENARIO_DICTS = {sid: s.to_dict() for sid, s in SCENARIOS.items()}
+SCENARIO_LIST = list(SCENARIO_DICTS.values())
+
 # ============================================================================
 # TLE Cache
 # ============================================================================
 
+@dataclass
+class SatBundle:
+    """
+    Pre-parsed constellation: satellites, their SoA columns and a warm SatrecArray.
+    Built once per TLE cache fill and shared by every propagating endpoint.
+    """
+    satellites: List[Satellite]
+    sat_array: SatrecArray
+    ids: np.ndarray
+    names: np.ndarray
+    orbit_types: np.ndarray
+    _records: Optional[List[dict]] = field(default=None, compare=False, repr=False)
+    
+    def __len__(self) -> int:
+        return len(self.satellites)
+    
+    def records(self) -> List[dict]:
+        """Satellite summaries for /satellites, built on first use; they only change with the TLEs"""
+        if self._records is None:
+            self._records = [
+                {"id": sat_id, "name": name, "orbit_type": orbit_type}
+                for sat_id, name, orbit_type in zip(
+                    self.ids.tolist(), self.names.tolist(), self.orbit_types.tolist()
+                )
+            ]
+        return self._records
+    
+    def propagate(self, jd: float, fr: float) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Propagate every satellite with a single SGP4 call on the warm SatrecArray.
+        Returns (errors, position, velocity) shaped (n,), (n, 3), (n, 3) in km, km/s.
+        """
+        errors, position, velocity = self.sat_array.sgp4(np.array([jd]), np.array([fr]))
+        return errors[:, 0], position[:, 0], velocity[:, 0]
+    
+    def head(self, n: int) -> "SatBundle":
+        """First n satellites as a new bundle"""
+        return self.slice(0, n)
+    
+    def slice(self, start: int, stop: int) -> "SatBundle":
+        """Satellites [start:stop] as a new bundle (column arrays are views)"""
+        if start <= 0 and stop >= len(self.satellites):
+            return self
+        satellites = self.satellites[start:stop]
+        return SatBundle(
+            satellites=satellites,
+            sat_array=build_sat_array(satellites),
+            ids=self.ids[start:stop],
+            names=self.names[start:stop],
+            orbit_types=self.orbit_types[start:stop]
+        )
+    
+    def select(self, indices: np.ndarray) -> "SatBundle":
+        """Satellites at the given indices as a new bundle"""
+        satellites = [self.satellites[i] for i in indices]
+        return SatBundle(
+            satellites=satellites,
+            sat_array=build_sat_array(satellites),
+            ids=self.ids[indices],
+            names=self.names[indices],
+            orbit_types=self.orbit_types[indices]
+        )
+
+@dataclass
+class CacheEntry:
+    bundle: SatBundle
+    timestamp: float
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
 class TLECache:
-    """Simple in-memory cache for TLE data"""
-    def __init__(self, ttl_seconds: int = 3600):  # 1 hour default
-        self.cache: dict[str, tuple[List[Satellite], float]] = {}
+    """Bounded LRU cache for TLE data, keeping CelesTrak validators for revalidation"""
+    def __init__(self, ttl_seconds: int = 3600, max_entries: int = 32):  # 1 hour default
+        self.cache: OrderedDict[str, CacheEntry] = OrderedDict()
         self.ttl = ttl_seconds
+        self.max_entries = max_entries
     
-    def get(self, scenario_id: str) -> Optional[List[Satellite]]:
-        if scenario_id in self.cache:
-            satellites, timestamp = self.cache[scenario_id]
-            if time.time() - timestamp < self.ttl:
-                return satellites
+    def get(self, scenario_id: str) -> Optional[SatBundle]:
+        entry = self.cache.get(scenario_id)
+        if entry and time.time() - entry.timestamp < self.ttl:
+            self.cache.move_to_end(scenario_id)
+            return entry.bundle
         return None
     
-    def set(self, scenario_id: str, satellites: List[Satellite]):
-        self.cache[scenario_id] = (satellites, time.time())
+    def get_stale(self, scenario_id: str) -> Optional[CacheEntry]:
+        """Return the entry even if expired, for conditional requests"""
+        return self.cache.get(scenario_id)
+    
+    def touch(self, scenario_id: str):
+        """Extend an entry's TTL after CelesTrak reports it unchanged"""
+        self.cache[scenario_id].timestamp = time.time()
+        self.cache.move_to_end(scenario_id)
+    
+    def set(
+        self,
+        scenario_id: str,
+        bundle: SatBundle,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None
+    ):
+        self.cache[scenario_id] = CacheEntry(bundle, time.time(), etag, last_modified)
+        self.cache.move_to_end(scenario_id)
+        while len(self.cache) > self.max_entries:
+            self.cache.popitem(last=False)
 
 tle_cache = TLECache()
 
+@dataclass
+class CachedResponse:
+    body: bytes
+    etag: str
+    timestamp: float
+
+class ResponseCache:
+    """Bounded LRU of encoded response bodies with a short TTL, for repeated polls"""
+    def __init__(self, ttl_seconds: float = 5, max_entries: int = 64):
+        self.cache: OrderedDict[tuple, CachedResponse] = OrderedDict()
+        self.ttl = ttl_seconds
+        self.max_entries = max_entries
+    
+    def get(self, key: tuple) -> Optional[CachedResponse]:
+        entry = self.cache.get(key)
+        if entry and time.time() - entry.timestamp < self.ttl:
+            self.cache.move_to_end(key)
+            return entry
+        return None
+    
+    def set(self, key: tuple, body: bytes) -> CachedResponse:
+        # Weak: the body differs per computation, so the tag only names this one
+        digest = hashlib.blake2b(repr(key).encode(), digest_size=8)
+        digest.update(str(time.time_ns()).encode())
+        entry = CachedResponse(body, f'W/"{digest.hexdigest()}"', time.time())
+        self.cache[key] = entry
+        self.cache.move_to_end(key)
+        while len(self.cache) > self.max_entries:
+            self.cache.popitem(last=False)
+        return entry
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    If-None-Match check: "*" or any tag in the comma-separated list, compared
+    weakly (W/ prefixes ignored) as RFC 9110 requires for this header
+    """
+    if not if_none_match:
+        return False
+    opaque = etag.removeprefix("W/")
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*" or tag.removeprefix("W/") == opaque:
+            return True
+    return False
+
+# /positions bodies are relative to now, so they are only reused briefly
+positions_cache = ResponseCache(ttl_seconds=5)
+
+# Satellites encoded per chunk by the NDJSON positions stream
+NDJSON_BATCH_SIZE = 512
+
+# Websocket update interval in seconds per orbit class; slow movers are
+# re-sent less often and clients interpolate between updates
+WS_UPDATE_INTERVALS = {
+    OrbitType.LEO: 1,
+    OrbitType.HEO: 1,  # Fast near perigee
+    OrbitType.MEO: 5,
+    OrbitType.GEO: 30,
+}
+
+# Seconds a websocket hub waits before retrying a failed TLE fetch
+TLE_RETRY_SECONDS = 10
+
+# positions.bin header: satellite count (u32) + unix timestamp (f64), little-endian
+BINARY_HEADER = struct.Struct("<Id")
+
+# /ws/positions_bin frame header: unix timestamp (u32) + satellite count (u32), little-endian
+WS_BINARY_HEADER = struct.Struct("<II")
+
+# Output float precision for position payloads; propagation always runs in float64
+PRECISIONS = {"fp32": np.float32, "fp64": np.float64}
+
+# Shared client so CelesTrak fetches reuse pooled (HTTP/2) connections
+HTTP_CLIENT = httpx.AsyncClient(
+    http2=True,
+    timeout=30.0,
+    headers={"Accept-Encoding": "gzip"},
+    limits=httpx.Limits(max_keepalive_connections=20)
+)
+
+# Propagation and record building run here so the event loop keeps serving
+# other requests and websocket clients while a large scenario is computed
+PROP_POOL = ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1))
+
 # ============================================================================
 # TLE Parsing & Orbital Propagation
 # ============================================================================
@@ -169,37 +381,45 @@ def classify_orbit(mean_motion: float, eccentricity: float) -> OrbitType:
 
 def parse_tle(tle_text: str) -> List[Satellite]:
     """Parse TLE format text into Satellite objects"""
-    lines = tle_text.strip().split('\n')
+    lines = tle_text.split('\n')
     satellites = []
     
     i = 0
-    while i < len(lines) - 2:
-        name = lines[i].strip()
-        line1 = lines[i + 1].strip()
-        line2 = lines[i + 2].strip()
+    last = len(lines) - 2
+    while i < last:
+        # Leading whitespace is tolerated; lstrip returns the line itself when there is none
+        line1 = lines[i + 1].lstrip()
+        line2 = lines[i + 2].lstrip()
         
         # Validate TLE lines
-        if not line1.startswith('1 ') or not line2.startswith('2 '):
+        if line1[:2] != '1 ' or line2[:2] != '2 ':
             i += 1
             continue
         
+        # TLE lines are fixed width, so slicing drops any trailing '\r' without a strip
+        name = lines[i].strip()
+        line1 = line1[:69]
+        line2 = line2[:69]
+        
         try:
             # Extract NORAD catalog number as ID
             norad_id = line1[2:7].strip()
             
             # Extract mean motion and eccentricity for orbit classification
             mean_motion = float(line2[52:63])
-            eccentricity = float(f"0.{line2[26:33]}")
+            eccentricity = int(line2[26:33]) * 1e-7  # Implied leading decimal point
             
             orbit_type = classify_orbit(mean_motion, eccentricity)
             
-            satellites.append(Satellite(
+            sat = Satellite(
                 id=norad_id,
                 name=name,
                 orbit_type=orbit_type,
                 tle_line1=line1,
                 tle_line2=line2
-            ))
+            )
+            sat._satrec = Satrec.twoline2rv(line1, line2)
+            satellites.append(sat)
         except (ValueError, IndexError) as e:
             print(f"Error parsing TLE for {name}: {e}")
         
@@ -207,7 +427,25 @@ def parse_tle(tle_text: str) -> List[Satellite]:
     
     return satellites
 
-async def fetch_tle_data(scenario_id: str) -> List[Satellite]:
+def build_sat_array(satellites: List[Satellite]) -> SatrecArray:
+    """Wrap the cached Satrec records in a SatrecArray for vectorized propagation"""
+    return SatrecArray([sat._satrec for sat in satellites])
+
+def build_bundle(satellites: List[Satellite]) -> SatBundle:
+    """Precompute the per-scenario SoA columns once per cache fill"""
+    return SatBundle(
+        satellites=satellites,
+        sat_array=build_sat_array(satellites),
+        ids=np.array([sat.id for sat in satellites], dtype=object),
+        names=np.array([sat.name for sat in satellites], dtype=object),
+        orbit_types=np.array([sat.orbit_type.value for sat in satellites], dtype=object)
+    )
+
+def parse_tle_bundle(tle_text: str) -> SatBundle:
+    """parse_tle + build_bundle as one callable for PROP_POOL"""
+    return build_bundle(parse_tle(tle_text))
+
+async def fetch_tle_data(scenario_id: str) -> SatBundle:
     """Fetch TLE data from CelesTrak"""
     # Check cache first
     cached = tle_cache.get(scenario_id)
@@ -215,80 +453,212 @@ async def fetch_tle_data(scenario_id: str) -> List[Satellite]:
         return cached
     
     if scenario_id not in SCENARIOS:
-        return []
+        return build_bundle([])
     
     scenario = SCENARIOS[scenario_id]
     
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(scenario.tle_url, timeout=30.0)
-            response.raise_for_status()
-            satellites = parse_tle(response.text)
-            
-            # Update scenario count
-            SCENARIOS[scenario_id] = Scenario(
-                id=scenario.id,
-                name=scenario.name,
-                description=scenario.description,
-                satellite_count=len(satellites),
-                tle_url=scenario.tle_url,
-                created_at=scenario.created_at
-            )
-            
-            # Cache the results
-            tle_cache.set(scenario_id, satellites)
-            
-            return satellites
-        except Exception as e:
-            print(f"Error fetching TLE data: {e}")
-            return []
-
-def propagate_satellite(satellite: Satellite, dt: datetime) -> dict:
-    """
-    Propagate satellite position using SGP4.
-    Returns lat/lon/alt for Cesium rendering.
-    """
+    # Revalidate an expired entry instead of re-downloading it
+    stale = tle_cache.get_stale(scenario_id)
+    headers = {}
+    if stale:
+        if stale.etag:
+            headers["If-None-Match"] = stale.etag
+        if stale.last_modified:
+            headers["If-Modified-Since"] = stale.last_modified
+    
     try:
-        # Create satellite record from TLE
-        sat = Satrec.twoline2rv(satellite.tle_line1, satellite.tle_line2)
+        response = await HTTP_CLIENT.get(scenario.tle_url, headers=headers)
+        if response.status_code == 304 and stale:
+            tle_cache.touch(scenario_id)
+            return stale.bundle
+        response.raise_for_status()
+        # Parsing a large feed (~13k twoline2rv calls for "active") is CPU-bound
+        bundle = await asyncio.get_running_loop().run_in_executor(
+            PROP_POOL, parse_tle_bundle, response.text
+        )
+        satellites = bundle.satellites
         
-        # Get Julian date
-        jd, fr = jday(dt.year, dt.month, dt.day, dt.hour, dt.minute, dt.second + dt.microsecond/1e6)
+        # Update scenario count
+        SCENARIOS[scenario_id] = Scenario(
+            id=scenario.id,
+            name=scenario.name,
+            description=scenario.description,
+            satellite_count=len(satellites),
+            tle_url=scenario.tle_url,
+            created_at=scenario.created_at
+        )
+        SCENARIO_DICTS[scenario_id]["satellite_count"] = len(satellites)
         
-        # Propagate
-        error, position, velocity = sat.sgp4(jd, fr)
+        # Cache the results
+        tle_cache.set(
+            scenario_id,
+            bundle,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified")
+        )
         
-        if error != 0:
-            return None
-        
-        # position is in km in TEME frame
-        x, y, z = position
-        vx, vy, vz = velocity
-        
-        # Convert TEME to geodetic (simplified - ignoring Earth rotation for demo)
-        # For accuracy, should use proper TEME to ITRF conversion
-        r = math.sqrt(x*x + y*y + z*z)
-        
-        # Approximate conversion to lat/lon/alt
-        lon = math.degrees(math.atan2(y, x))
-        lat = math.degrees(math.asin(z / r))
-        alt = (r - 6371.0) * 1000  # Convert to meters above Earth surface
-        
-        # Calculate velocity magnitude
-        vel = math.sqrt(vx*vx + vy*vy + vz*vz)
-        
-        return {
-            "id": satellite.id,
-            "name": satellite.name,
-            "orbit_type": satellite.orbit_type.value,
-            "longitude": lon,
-            "latitude": lat,
-            "altitude": alt,
-            "velocity": vel
-        }
+        return bundle
     except Exception as e:
-        print(f"Error propagating {satellite.name}: {e}")
-        return None
+        print(f"Error fetching TLE data: {e}")
+        return build_bundle([])
+
+def row_norm(v: np.ndarray) -> np.ndarray:
+    """Euclidean norm of each row of an (n, 3) array, without linalg.norm's temporaries"""
+    return np.sqrt(np.einsum("ij,ij->i", v, v))
+
+def teme_to_geodetic(r_km: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Vectorized (n, 3) TEME km -> (lon deg, lat deg, alt m)"""
+    # Convert TEME to geodetic (simplified - ignoring Earth rotation for demo)
+    # For accuracy, should use proper TEME to ITRF conversion
+    # Each output owns one buffer that later steps update in place, so the
+    # conversion allocates three arrays instead of one per operation
+    x, y, z = r_km.T
+    r = row_norm(r_km)
+    lon = np.arctan2(y, x)
+    np.degrees(lon, out=lon)
+    lat = np.divide(z, r)
+    np.degrees(np.arcsin(lat, out=lat), out=lat)
+    alt = np.subtract(r, 6371.0, out=r)
+    alt *= 1000  # Convert to meters above Earth surface
+    return lon, lat, alt
+
+def float_values(column: np.ndarray, dtype: type = np.float64) -> list:
+    """
+    Column as a list for record building. float64 becomes Python floats; float32
+    stays NumPy scalars so orjson prints the short float32 form (OPT_SERIALIZE_NUMPY).
+    """
+    if dtype is np.float64:
+        return column.tolist()
+    return list(column.astype(dtype))
+
+def positions_to_records(
+    ids: np.ndarray,
+    names: np.ndarray,
+    orbit_types: np.ndarray,
+    r_km: np.ndarray,
+    v_km: Optional[np.ndarray],
+    dtype: type = np.float64
+) -> List[dict]:
+    """
+    Convert TEME position/velocity arrays of shape (n, 3) into position records.
+    Returns lat/lon/alt for Cesium rendering; velocity is omitted when v_km is None.
+    """
+    lon, lat, alt = (float_values(c, dtype) for c in teme_to_geodetic(r_km))
+    
+    if v_km is None:
+        return [
+            {
+                "id": sat_id,
+                "name": name,
+                "orbit_type": orbit_type,
+                "longitude": lo,
+                "latitude": la,
+                "altitude": al
+            }
+            for sat_id, name, orbit_type, lo, la, al in zip(
+                ids, names, orbit_types, lon, lat, alt
+            )
+        ]
+    
+    vel = float_values(row_norm(v_km), dtype)
+    return [
+        {
+            "id": sat_id,
+            "name": name,
+            "orbit_type": orbit_type,
+            "longitude": lo,
+            "latitude": la,
+            "altitude": al,
+            "velocity": ve
+        }
+        for sat_id, name, orbit_type, lo, la, al, ve in zip(
+            ids, names, orbit_types, lon, lat, alt, vel
+        )
+    ]
+
+def positions_to_columns(
+    ids: np.ndarray,
+    names: np.ndarray,
+    orbit_types: np.ndarray,
+    r_km: np.ndarray,
+    v_km: Optional[np.ndarray],
+    dtype: type = np.float64
+) -> dict:
+    """
+    Columnar counterpart of positions_to_records: one list/array per field.
+    Float columns stay NumPy arrays, which orjson encodes without per-item objects.
+    """
+    lon, lat, alt = (c.astype(dtype, copy=False) for c in teme_to_geodetic(r_km))
+    columns = {
+        "id": ids.tolist(),
+        "name": names.tolist(),
+        "orbit_type": orbit_types.tolist(),
+        "longitude": lon,
+        "latitude": lat,
+        "altitude": alt
+    }
+    if v_km is not None:
+        columns["velocity"] = row_norm(v_km).astype(dtype, copy=False)
+    return columns
+
+def position_count(positions) -> int:
+    """Number of satellites in a records list or a columns dict"""
+    return len(positions["id"]) if isinstance(positions, dict) else len(positions)
+
+def julian_date(dt: datetime) -> tuple[float, float]:
+    """Split a datetime into the (jd, fr) Julian date pair SGP4 expects"""
+    return jday(dt.year, dt.month, dt.day, dt.hour, dt.minute, dt.second + dt.microsecond/1e6)
+
+def compute_positions(
+    bundle: SatBundle, jd: float, fr: float, include_velocity: bool = True, columnar: bool = False,
+    dtype: type = np.float64
+):
+    """
+    Propagate all satellites to (jd, fr) using SGP4, dropping any that fail to propagate.
+    Returns a list of records, or a dict of columns when columnar is set, with
+    float values in dtype.
+    """
+    errors, position, velocity = bundle.propagate(jd, fr)
+    ids, names, orbit_types = bundle.ids, bundle.names, bundle.orbit_types
+    
+    ok = errors == 0
+    if not ok.all():
+        ids, names, orbit_types = ids[ok], names[ok], orbit_types[ok]
+        position, velocity = position[ok], velocity[ok]
+    
+    if not include_velocity:
+        velocity = None
+    
+    to_payload = positions_to_columns if columnar else positions_to_records
+    return to_payload(ids, names, orbit_types, position, velocity, dtype)
+
+async def propagate_async(bundle: SatBundle, jd: float, fr: float) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """bundle.propagate on PROP_POOL"""
+    return await asyncio.get_running_loop().run_in_executor(PROP_POOL, bundle.propagate, jd, fr)
+
+async def compute_positions_async(
+    bundle: SatBundle, jd: float, fr: float, include_velocity: bool = True, columnar: bool = False,
+    dtype: type = np.float64
+):
+    """compute_positions on PROP_POOL"""
+    return await asyncio.get_running_loop().run_in_executor(
+        PROP_POOL, compute_positions, bundle, jd, fr, include_velocity, columnar, dtype
+    )
+
+# In-flight computations keyed by request parameters, shared by concurrent callers
+_inflight: dict[tuple, asyncio.Task] = {}
+
+async def coalesced(key: tuple, make_coro: Callable[[], Awaitable]):
+    """
+    Await the in-flight computation for key, starting it if there is none.
+    The task is shielded so one caller disconnecting doesn't cancel it for the rest.
+    """
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(make_coro())
+        _inflight[key] = task
+        task.add_done_callback(lambda _: _inflight.pop(key, None))
+    return await asyncio.shield(task)
 
 # ============================================================================
 # API Endpoints
@@ -304,6 +674,8 @@ async def root():
             "scenarios": "/api/scenarios",
             "satellites": "/api/scenarios/{id}/satellites",
             "positions": "/api/scenarios/{id}/positions",
+            "positions_stream": "/api/scenarios/{id}/positions.ndjson",
+            "positions_binary": "/api/scenarios/{id}/positions.bin",
             "compare": "/api/compare"
         }
     }
@@ -311,7 +683,7 @@ async def root():
 @app.get("/api/scenarios")
 async def list_scenarios():
     """List all available scenarios"""
-    return {"scenarios": [asdict(s) for s in SCENARIOS.values()]}
+    return {"scenarios": SCENARIO_LIST}
 
 @app.get("/api/scenarios/{scenario_id}")
 async def get_scenario(scenario_id: str):
@@ -320,81 +692,209 @@ async def get_scenario(scenario_id: str):
         return {"error": "Scenario not found"}, 404
     
     # Fetch to update satellite count
-    satellites = await fetch_tle_data(scenario_id)
+    await fetch_tle_data(scenario_id)
     
-    return asdict(SCENARIOS[scenario_id])
+    return SCENARIO_DICTS[scenario_id]
+
+# Encoded /satellites bodies with the bundle they were built from; an entry
+# is reused until a TLE refresh produces a different bundle. Only ids in
+# SCENARIOS get an entry, so the URL can't grow this dict
+SATELLITES_BODIES: dict[str, tuple[SatBundle, bytes]] = {}
+
+def encode_satellites_body(scenario_id: str, records: List[dict], elapsed: float) -> bytes:
+    return orjson.dumps({
+        "scenario_id": scenario_id,
+        "count": len(records),
+        "satellites": records,
+        "_meta": {
+            "fetch_time_ms": round(elapsed * 1000, 2),
+            "data_source": "CelesTrak"
+        }
+    })
 
 @app.get("/api/scenarios/{scenario_id}/satellites")
 async def get_satellites(scenario_id: str):
-    """Get all satellites in a scenario"""
-    start = time.perf_counter()
+    """
+    Get all satellites in a scenario.
+    The body is encoded once per TLE bundle; fetch_time_ms is from that build.
+    """
+    if scenario_id not in SCENARIOS:
+        return Response(content=encode_satellites_body(scenario_id, [], 0.0), media_type="application/json")
     
-    satellites = await fetch_tle_data(scenario_id)
+    start = time.perf_counter()
     
-    result = []
-    for sat in satellites:
-        result.append({
-            "id": sat.id,
-            "name": sat.name,
-            "orbit_type": sat.orbit_type.value
-        })
+    bundle = await fetch_tle_data(scenario_id)
+    cached = SATELLITES_BODIES.get(scenario_id)
     
-    elapsed = time.perf_counter() - start
+    if cached is None or cached[0] is not bundle:
+        result = bundle.records()
+        body = encode_satellites_body(scenario_id, result, time.perf_counter() - start)
+        cached = SATELLITES_BODIES[scenario_id] = (bundle, body)
     
-    return {
-        "scenario_id": scenario_id,
-        "count": len(result),
-        "satellites": result,
-        "_meta": {
-            "fetch_time_ms": round(elapsed * 1000, 2),
-            "data_source": "CelesTrak"
-        }
-    }
+    return Response(content=cached[1], media_type="application/json")
 
 @app.get("/api/scenarios/{scenario_id}/positions")
 async def get_positions(
     scenario_id: str,
     time_offset: float = Query(0, description="Time offset in seconds from now"),
-    limit: Optional[int] = Query(None, description="Limit number of satellites returned")
+    limit: Optional[int] = Query(None, description="Limit number of satellites returned"),
+    include_velocity: bool = Query(True, description="Include velocity magnitude in each position"),
+    layout: str = Query("aos", alias="format", pattern="^(aos|soa)$", description="aos: list of records, soa: columns"),
+    chunk_size: Optional[int] = Query(None, gt=0, description="Satellites per chunk for progressive loading"),
+    chunk_index: int = Query(0, ge=0, description="Chunk to return when chunk_size is set"),
+    precision: str = Query("fp64", pattern="^(fp32|fp64)$", description="Float precision of position values"),
+    if_none_match: Optional[str] = Header(None)
 ):
     """
     Get current positions for all satellites.
     Uses SGP4 propagation for accurate positioning.
+    Concurrent requests for the same parameters share one computation, and the
+    encoded body is reused for repeat polls within positions_cache's TTL.
     """
+    # Offsets within 0.1 s share a computation; the body is built for the rounded
+    # offset so it matches every request it is served to
+    time_offset = round(time_offset, 1)
+    key = (
+        "positions", scenario_id, time_offset, limit, include_velocity, layout,
+        chunk_size, chunk_index, precision
+    )
+    entry = positions_cache.get(key)
+    if entry is None:
+        entry = await coalesced(key, lambda: build_positions_entry(
+            key, scenario_id, time_offset, limit, include_velocity, layout, chunk_size, chunk_index, precision
+        ))
+    
+    headers = {"ETag": entry.etag, "Cache-Control": f"max-age={positions_cache.ttl:g}"}
+    if etag_matches(if_none_match, entry.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
+
+async def build_positions_entry(key: tuple, *args) -> CachedResponse:
+    """build_positions_payload, encoded and stored in positions_cache under key"""
+    payload = await build_positions_payload(*args)
+    # Encoding here rather than returning the dict skips FastAPI's jsonable_encoder
+    # walk over every position; orjson encodes the payload in one C pass
+    body = orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY)
+    return positions_cache.set(key, body)
+
+async def build_positions_payload(
+    scenario_id: str,
+    time_offset: float,
+    limit: Optional[int],
+    include_velocity: bool,
+    layout: str,
+    chunk_size: Optional[int] = None,
+    chunk_index: int = 0,
+    precision: str = "fp64"
+) -> dict:
+    """Fetch, propagate and assemble the /positions response body"""
     start = time.perf_counter()
     
-    satellites = await fetch_tle_data(scenario_id)
+    bundle = await fetch_tle_data(scenario_id)
     
-    if limit:
-        satellites = satellites[:limit]
+    # Chunk the one fetched bundle; total comes from it rather than a second fetch.
+    # limit and chunk bounds are folded into a single slice: its columns are views
+    # of the cached bundle and only the chunk's SatrecArray is rebuilt
+    total = min(limit, len(bundle)) if limit else len(bundle)
+    start_idx, stop_idx = 0, total
+    if chunk_size:
+        start_idx = chunk_index * chunk_size
+        stop_idx = min(start_idx + chunk_size, total)
+    bundle = bundle.slice(start_idx, stop_idx)
     
     # Calculate target time
     target_time = datetime.now(timezone.utc)
     if time_offset:
-        from datetime import timedelta
         target_time = target_time + timedelta(seconds=time_offset)
     
-    positions = []
-    for sat in satellites:
-        pos = propagate_satellite(sat, target_time)
-        if pos:
-            positions.append(pos)
+    positions = await compute_positions_async(
+        bundle, *julian_date(target_time), include_velocity, layout == "soa", PRECISIONS[precision]
+    )
     
     elapsed = time.perf_counter() - start
     
+    meta = {
+        "computation_time_ms": round(elapsed * 1000, 2),
+        "data_source": "CelesTrak",
+        "propagator": "SGP4"
+    }
+    if chunk_size:
+        meta["chunk_index"] = chunk_index
+        meta["chunk_size"] = chunk_size
+        meta["total_chunks"] = max(1, math.ceil(total / chunk_size))
+    
     return {
         "scenario_id": scenario_id,
         "timestamp": target_time.isoformat(),
         "time_offset_seconds": time_offset,
-        "count": len(positions),
+        "count": position_count(positions),
         "positions": positions,
-        "_meta": {
-            "computation_time_ms": round(elapsed * 1000, 2),
-            "data_source": "CelesTrak",
-            "propagator": "SGP4"
-        }
+        "_meta": meta
     }
 
+@app.get("/api/scenarios/{scenario_id}/positions.ndjson")
+async def stream_positions(
+    scenario_id: str,
+    time_offset: float = Query(0, description="Time offset in seconds from now"),
+    precision: str = Query("fp32", pattern="^(fp32|fp64)$", description="Float precision of position values")
+):
+    """
+    Stream positions as newline-delimited JSON, one satellite per line.
+    Records are built and encoded in batches so large scenarios never hold
+    the whole JSON body in memory.
+    """
+    bundle = await fetch_tle_data(scenario_id)
+    
+    target_time = datetime.now(timezone.utc)
+    if time_offset:
+        target_time = target_time + timedelta(seconds=time_offset)
+    
+    errors, position, velocity = await propagate_async(bundle, *julian_date(target_time))
+    valid = np.flatnonzero(errors == 0)
+    dtype = PRECISIONS[precision]
+    
+    async def generate():
+        for start in range(0, len(valid), NDJSON_BATCH_SIZE):
+            idx = valid[start:start + NDJSON_BATCH_SIZE]
+            records = positions_to_records(
+                bundle.ids[idx], bundle.names[idx], bundle.orbit_types[idx], position[idx], velocity[idx], dtype
+            )
+            yield b"".join(
+                orjson.dumps(rec, option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_SERIALIZE_NUMPY)
+                for rec in records
+            )
+    
+    return StreamingResponse(
+        generate(),
+        media_type="application/x-ndjson",
+        # Stop nginx from buffering the body, which would undo the streaming
+        headers={"X-Timestamp": target_time.isoformat(), "X-Accel-Buffering": "no"}
+    )
+
+@app.get("/api/scenarios/{scenario_id}/positions.bin")
+async def get_positions_binary(
+    scenario_id: str,
+    time_offset: float = Query(0, description="Time offset in seconds from now")
+):
+    """
+    Raw TEME positions as a little-endian binary frame for WebGL clients.
+    Layout: BINARY_HEADER, then n_sats * (x, y, z) float32 km in /satellites
+    order. Satellites that failed to propagate are NaN.
+    """
+    bundle = await fetch_tle_data(scenario_id)
+    
+    target_time = datetime.now(timezone.utc)
+    if time_offset:
+        target_time = target_time + timedelta(seconds=time_offset)
+    
+    _, position, _ = await propagate_async(bundle, *julian_date(target_time))
+    
+    header = BINARY_HEADER.pack(len(bundle), target_time.timestamp())
+    return Response(
+        content=header + position.astype(np.float32).tobytes(),
+        media_type="application/octet-stream"
+    )
+
 @app.get("/api/compare")
 async def compare_scenarios(
     scenario_ids: str = Query(..., description="Comma-separated scenario IDs"),
@@ -403,45 +903,42 @@ async def compare_scenarios(
     """Compare multiple scenarios"""
     start = time.perf_counter()
     ids = [s.strip() for s in scenario_ids.split(",")]
+    valid_ids = [sid for sid in dict.fromkeys(ids) if sid in SCENARIOS]
     
     comparison = {}
     target_time = datetime.now(timezone.utc)
     
-    for scenario_id in ids:
-        if scenario_id not in SCENARIOS:
-            continue
-        
-        satellites = await fetch_tle_data(scenario_id)
-        
+    # Fetch all scenarios concurrently so cold-cache latency overlaps
+    results = await asyncio.gather(*[fetch_tle_data(sid) for sid in valid_ids])
+    
+    for scenario_id, bundle in zip(valid_ids, results):
         if metric == "altitude":
-            altitudes = []
-            for sat in satellites[:100]:  # Limit for performance
-                pos = propagate_satellite(sat, target_time)
-                if pos:
-                    altitudes.append(pos["altitude"] / 1000)  # km
+            sample = bundle.head(100)  # Limit for performance
+            errors, position, _ = await propagate_async(sample, *julian_date(target_time))
+            altitudes = row_norm(position[errors == 0]) - 6371.0  # km
             
-            if altitudes:
+            if altitudes.size:
                 comparison[scenario_id] = {
-                    "min": min(altitudes),
-                    "max": max(altitudes),
-                    "mean": sum(altitudes) / len(altitudes),
+                    "min": float(altitudes.min()),
+                    "max": float(altitudes.max()),
+                    "mean": float(altitudes.mean()),
                     "unit": "km"
                 }
         else:  # count
             comparison[scenario_id] = {
-                "satellite_count": len(satellites),
+                "satellite_count": len(bundle),
                 "name": SCENARIOS[scenario_id].name
             }
     
     elapsed = time.perf_counter() - start
     
-    return {
+    return ORJSONResponse({
         "metric": metric,
         "comparison": comparison,
         "_meta": {
             "computation_time_ms": round(elapsed * 1000, 2)
         }
-    }
+    })
 
 @app.get("/api/health")
 async def health_check():
@@ -449,34 +946,259 @@ async def health_check():
     return {"status": "healthy", "timestamp": datetime.now(timezone.utc).isoformat()}
 
 # WebSocket for real-time updates
-@app.websocket("/ws/positions/{scenario_id}")
-async def websocket_positions(websocket: WebSocket, scenario_id: str):
-    """WebSocket endpoint for real-time position streaming"""
-    await websocket.accept()
+
+def offer_frame(queue: asyncio.Queue, frame) -> bool:
+    """Put frame on queue, dropping the oldest one if full. Returns False if a frame was dropped."""
+    try:
+        queue.put_nowait(frame)
+        return True
+    except asyncio.QueueFull:
+        queue.get_nowait()
+        queue.put_nowait(frame)
+        return False
+
+class BroadcastHub:
+    """
+    One propagation loop per (scenario, payload variant), fanned out to every
+    subscribed websocket. Each frame is computed and encoded once per tick.
+    """
+    def __init__(self, key: tuple, scenario_id: str, include_velocity: bool, layout: str, precision: str):
+        self.key = key
+        self.scenario_id = scenario_id
+        self.include_velocity = include_velocity
+        self.dtype = PRECISIONS[precision]
+        # msgpack frames carry the columnar payload as binary; raw frames
+        # are WS_BINARY_HEADER + float32 TEME positions for every satellite
+        self.columnar = layout != "aos"
+        self.binary = layout == "msgpack"
+        self.raw = layout == "bin"
+        self.subscribers: set[asyncio.Queue] = set()
+        self.task: Optional[asyncio.Task] = None
+        # Next tick sends every orbit class, for new or lagging subscribers
+        self.full_refresh = True
+        # Background TLE fetch, and the loop time before which a failed one isn't retried
+        self._refresh: Optional[asyncio.Task] = None
+        self._retry_at = 0.0
     
-    satellites = await fetch_tle_data(scenario_id)
+    def subscribe(self) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=2)
+        self.subscribers.add(queue)
+        self.full_refresh = True
+        if self.task is None:
+            self.task = asyncio.create_task(self.run())
+        return queue
     
-    try:
+    def unsubscribe(self, queue: asyncio.Queue):
+        self.subscribers.discard(queue)
+        if not self.subscribers:
+            if self.task:
+                self.task.cancel()
+            self._detach()
+    
+    def _detach(self):
+        if hubs.get(self.key) is self:
+            del hubs[self.key]
+    
+    async def run(self):
+        try:
+            await self._tick_loop()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"Error in position broadcast for {self.scenario_id}: {e}")
+        finally:
+            if self._refresh:
+                self._refresh.cancel()
+        # Wake subscribers so their handlers close instead of waiting forever
+        self._detach()
+        for queue in self.subscribers:
+            offer_frame(queue, None)
+    
+    def encode_frame(self, message: dict):
+        """
+        msgpack bytes for binary hubs (9 bytes per float64, 5 per float32
+        vs ~18 as JSON text), otherwise an orjson text frame so clients can JSON.parse it
+        """
+        if self.binary:
+            return msgpack.packb(
+                message, default=lambda a: a.tolist(), use_single_float=self.dtype is np.float32
+            )
+        return orjson.dumps(message, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+    
+    def latest_bundle(self, loop: asyncio.AbstractEventLoop) -> Optional[SatBundle]:
+        """
+        Current cached TLE bundle for the scenario, or None while it is missing or expired.
+        The fetch that refills the cache runs in the background so an expired entry or
+        a CelesTrak outage never stalls ticks; failed fetches wait TLE_RETRY_SECONDS.
+        """
+        if self._refresh is not None and self._refresh.done():
+            fetched, self._refresh = self._refresh.result(), None
+            if not fetched:
+                self._retry_at = loop.time() + TLE_RETRY_SECONDS
+        
+        latest = tle_cache.get(self.scenario_id)
+        if latest is None and self._refresh is None and loop.time() >= self._retry_at:
+            self._refresh = asyncio.create_task(fetch_tle_data(self.scenario_id))
+        return latest
+    
+    async def _tick_loop(self):
+        loop = asyncio.get_running_loop()
+        bundle = await fetch_tle_data(self.scenario_id)
+        if not bundle:
+            self._retry_at = loop.time() + TLE_RETRY_SECONDS
+        
+        # The set of orbit classes due on a tick repeats with a short period, so
+        # the merged bundle for each due set is selected once and reused
+        present = set(bundle.orbit_types.tolist())
+        due_bundles: dict[tuple[str, ...], SatBundle] = {}
+        
+        # Convert the start time once, then advance (jd, fr) by one second per tick
+        start_time = datetime.now(timezone.utc)
+        jd, fr = julian_date(start_time)
+        tick = 0
+        next_tick = loop.time()
+        
         while True:
-            target_time = datetime.now(timezone.utc)
+            # Swap in refreshed TLEs; a failed fetch never replaces the bundle in use
+            latest = self.latest_bundle(loop)
+            if latest is not None and latest is not bundle:
+                bundle = latest
+                present = set(bundle.orbit_types.tolist())
+                due_bundles.clear()
+                self.full_refresh = True
             
-            positions = []
-            for sat in satellites:
-                pos = propagate_satellite(sat, target_time)
-                if pos:
-                    positions.append(pos)
+            if self.raw:
+                # Whole constellation in /satellites order each tick, failed propagations NaN
+                _, position, _ = await propagate_async(bundle, jd, fr)
+                header = WS_BINARY_HEADER.pack(int(start_time.timestamp()) + tick, len(bundle))
+                frame = header + position.astype(np.float32).tobytes()
+            else:
+                full_refresh, self.full_refresh = self.full_refresh, False
+                changed = tuple(
+                    orbit_type.value for orbit_type, interval in WS_UPDATE_INTERVALS.items()
+                    if orbit_type.value in present and (full_refresh or tick % interval == 0)
+                )
+                due = due_bundles.get(changed)
+                if due is None:
+                    due = due_bundles[changed] = bundle.select(
+                        np.flatnonzero(np.isin(bundle.orbit_types, changed))
+                    )
+                
+                positions = await compute_positions_async(
+                    due, jd, fr, self.include_velocity, self.columnar, self.dtype
+                )
+                
+                # Encode once for all subscribers
+                frame = self.encode_frame({
+                    "timestamp": (start_time + timedelta(seconds=tick)).isoformat(),
+                    "count": position_count(positions),
+                    "changed": changed,
+                    "positions": positions
+                })
             
-            await websocket.send_json({
-                "timestamp": target_time.isoformat(),
-                "count": len(positions),
-                "positions": positions
-            })
+            # Slow clients lose their oldest frame rather than stalling the loop;
+            # the dropped frame may have carried slow orbit classes, so resend all
+            for queue in self.subscribers:
+                if not offer_frame(queue, frame):
+                    self.full_refresh = True
             
-            await asyncio.sleep(1)  # Update every second
+            tick += 1
+            fr += 1.0 / 86400.0
+            if fr >= 1.0:
+                jd += 1.0
+                fr -= 1.0
             
-    except WebSocketDisconnect:
+            # Update every second, pacing against the loop clock so ticks don't drift
+            next_tick += 1.0
+            await asyncio.sleep(max(0.0, next_tick - loop.time()))
+
+hubs: dict[tuple, BroadcastHub] = {}
+
+@app.websocket("/ws/positions/{scenario_id}")
+async def websocket_positions(
+    websocket: WebSocket,
+    scenario_id: str,
+    include_velocity: bool = Query(True, description="Include velocity magnitude in each position"),
+    layout: str = Query(
+        "aos", alias="format", pattern="^(aos|soa|msgpack)$",
+        description="aos: list of records, soa: columns, msgpack: columns as binary msgpack frames"
+    ),
+    precision: str = Query("fp32", pattern="^(fp32|fp64)$", description="Float precision of position values")
+):
+    """WebSocket endpoint for real-time position streaming"""
+    await websocket.accept()
+    
+    key = (scenario_id, include_velocity, layout, precision)
+    await relay_hub_frames(
+        websocket, key, lambda: BroadcastHub(key, scenario_id, include_velocity, layout, precision)
+    )
+
+@app.websocket("/ws/positions_bin/{scenario_id}")
+async def websocket_positions_binary(websocket: WebSocket, scenario_id: str):
+    """
+    Binary position stream for WebGL clients, one frame per second.
+    Layout: WS_BINARY_HEADER, then n_sats * (x, y, z) float32 TEME km in
+    /satellites order, about 12 bytes per satellite. Failed propagations are NaN.
+    """
+    await websocket.accept()
+    
+    key = (scenario_id, "bin")
+    await relay_hub_frames(
+        websocket, key, lambda: BroadcastHub(key, scenario_id, False, "bin", "fp32")
+    )
+
+async def relay_hub_frames(websocket: WebSocket, key: tuple, make_hub: Callable[[], BroadcastHub]):
+    """Subscribe to the hub for key, creating it if needed, and send its frames until either side stops"""
+    hub = hubs.get(key)
+    if hub is None:
+        hub = hubs[key] = make_hub()
+    queue = hub.subscribe()
+    
+    # Reading alongside sending notices a disconnect right away instead of on
+    # the next send, which can be 30 s off when only GEO satellites are due
+    sender = asyncio.create_task(send_hub_frames(websocket, queue))
+    receiver = asyncio.create_task(wait_for_disconnect(websocket))
+    try:
+        done, _ = await asyncio.wait({sender, receiver}, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            task.result()
+    finally:
+        sender.cancel()
+        receiver.cancel()
+        hub.unsubscribe(queue)
+
+async def send_hub_frames(websocket: WebSocket, queue: asyncio.Queue):
+    """Send queued frames until the hub stops (None) or the client goes away"""
+    try:
+        while True:
+            frame = await queue.get()
+            if frame is None:
+                await websocket.close()
+                return
+            if isinstance(frame, bytes):
+                await websocket.send_bytes(frame)
+            else:
+                await websocket.send_text(frame)
+    # uvicorn raises ClientDisconnected (an IOError) when sending on a closed socket
+    except (WebSocketDisconnect, IOError):
         pass
 
+async def wait_for_disconnect(websocket: WebSocket):
+    """Drain client messages, which the position streams ignore, until the client disconnects"""
+    while True:
+        message = await websocket.receive()
+        if message["type"] == "websocket.disconnect":
+            return
+
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    # uvloop/httptools ship with uvicorn[standard]. Each worker keeps its own
+    # TLE cache; conditional CelesTrak requests keep the refresh cost low.
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop",
+        http="httptools",
+        workers=int(os.environ.get("WEB_CONCURRENCY", 4))
+    )
\ No newline at end of file
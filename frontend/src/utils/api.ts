@@ -103,6 +103,33 @@ export async function* fetchPositionsChunked(
   }
 }
 
+/**
+ * Fetch raw TEME positions (x, y, z in km per satellite) as a Float32Array
+ * Satellite order matches fetchSatellites; NaN marks failed propagations
+ */
+export async function fetchPositionsBinary(
+  scenarioId: string,
+  timeOffset: number = 0
+): Promise<{ count: number; timestamp: number; positions: Float32Array }> {
+  const response = await fetch(
+    `${API_BASE}/scenarios/${scenarioId}/positions.bin?time_offset=${timeOffset}`
+  );
+  if (!response.ok) {
+    throw new Error(`API error: ${response.status} ${response.statusText}`);
+  }
+
+  // Header: u32 count + f64 unix timestamp, little-endian
+  const buffer = await response.arrayBuffer();
+  const header = new DataView(buffer, 0, 12);
+  const count = header.getUint32(0, true);
+
+  return {
+    count,
+    timestamp: header.getFloat64(4, true),
+    positions: new Float32Array(buffer, 12, count * 3),
+  };
+}
+
 export async function compareScenarios(
   scenarioIds: string[],
   metric: 'coverage' | 'velocity' | 'altitude' = 'coverage',
@@ -181,6 +208,38 @@ export function createWebSocketConnection(
   };
 }
 
+/**
+ * Create a binary WebSocket stream of raw TEME positions (x, y, z in km)
+ * Satellite order matches fetchSatellites; NaN marks failed propagations
+ */
+export function createBinaryPositionSocket(
+  scenarioId: string,
+  onData: (data: { timestamp: number; count: number; positions: Float32Array }) => void,
+  onError?: (error: Error) => void
+): () => void {
+  const ws = new WebSocket(`ws://${window.location.host}/ws/positions_bin/${scenarioId}`);
+  ws.binaryType = 'arraybuffer';
+
+  ws.onmessage = (event) => {
+    // Header: u32 unix timestamp + u32 count, little-endian
+    const buffer = event.data as ArrayBuffer;
+    const header = new DataView(buffer, 0, 8);
+    const count = header.getUint32(4, true);
+
+    onData({
+      timestamp: header.getUint32(0, true),
+      count,
+      positions: new Float32Array(buffer, 8, count * 3),
+    });
+  };
+
+  ws.onerror = () => {
+    onError?.(new Error('WebSocket connection error'));
+  };
+
+  return () => ws.close();
+}
+
 // ============================================================================
 // Performance Utilities
 // ============================================================================